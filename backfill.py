@@ -0,0 +1,5 @@
+# Kept so `python backfill.py` still works; the code lives in loum/backfill.py.
+from loum.backfill import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,4 @@
+from .core import LOUM, MONOPOLISTIC, get_transaction_list
+from .exact import LOUM_exact, to_wei
+
+__all__ = ['LOUM', 'LOUM_exact', 'MONOPOLISTIC', 'get_transaction_list', 'to_wei']
@@ -0,0 +1,118 @@
+from .core import INPUT_FILE, LOUM, calculate_correlation, calculate_correlation_time_cross
+from .exact import LOUM_exact, WEI_PER_ETHER
+from .shared import SharedBlockColumns, map_blocks, worker_block
+from . import plots
+
+
+def block_stats(bids, original_payments, original_revenue, count_winners_orginal):
+    # Integer bids mean exact mode, everything below then stays in wei
+    exact = bids.dtype.kind == 'u'
+    bids, original_payments = bids.tolist(), original_payments.tolist()
+    original_utilities = [bids[i]-original_payments[i] if original_payments[i] != -1 else 0 for i in range(len(bids))]
+    ordered_bids = sorted(bids, reverse=True)
+    if exact:
+        payment, winners_after_budget, revenue_after_budget = LOUM_exact(ordered_bids)
+    else:
+        payment, winners_after_budget, revenue_after_budget = LOUM(ordered_bids)
+    LOUM_utilities = [ordered_bids[i]-payment if i<len(winners_after_budget) else 0 for i in range(len(ordered_bids))]
+    return {
+        'bids_length': len(bids),
+        'block_size': count_winners_orginal,
+        'original_sum_utility': sum(original_utilities),
+        'LOUM_sum_utility': sum(LOUM_utilities),
+        'payment': payment,
+        'winners': len(winners_after_budget),
+        'revenue': revenue_after_budget,
+        'original_revenue': original_revenue,
+    }
+
+
+def _block_stats(i):
+    return block_stats(*worker_block(i))
+
+
+def analyze_blocks(input_file=INPUT_FILE, processes=1, exact=False, include_backfilled=False):
+    # The block file is parsed once into shared memory; with processes > 1 the
+    # blocks are spread over a pool whose workers read them from there
+    with SharedBlockColumns.from_file(input_file, exact) as columns:
+        indices = range(len(columns))
+        if not include_backfilled:
+            # Without their mempool losers these would show every bidder winning
+            indices = [i for i in indices if not columns.arrays['backfilled'][i]]
+            if len(indices) < len(columns):
+                print(f"Skipping {len(columns) - len(indices)} backfilled blocks (no mempool data)")
+        if processes == 1:
+            return [block_stats(*columns.block(i)) for i in indices]
+        return map_blocks(_block_stats, columns, processes, indices=indices)
+
+
+def main(input_file=INPUT_FILE, processes=1, exact=False, include_backfilled=False):
+    revenues = []
+    original_revenues = []
+    LOUM_fraction_of_winners = []
+    original_fraction_of_winners = []
+    original_avg_payments, LOUM_avg_payments = [], []
+    LOUM_avg_payments = []
+    original_sum_utilities, LOUM_sum_utilities = [],[]
+    bids_length = []
+    avg_block_size = []
+
+    # In exact mode a value that doesn't fit raises instead of quietly going back to floats
+    stats = analyze_blocks(input_file, processes, exact, include_backfilled)
+    # Report in Ether either way
+    unit = WEI_PER_ETHER if exact else 1
+
+    for block in stats:
+        avg_block_size.append(block['block_size'])
+        bids_length.append(block['bids_length'])
+        original_sum_utilities.append(block['original_sum_utility'] / unit)
+        LOUM_sum_utilities.append(block['LOUM_sum_utility'] / unit)
+        if block['winners'] > 0.1*block['bids_length']:
+            original_avg_payments.append(original_sum_utilities[-1] / block['bids_length'])
+            LOUM_avg_payments.append(block['payment'] / unit)
+        revenues.append(block['revenue'] / unit)
+        original_revenues.append(block['original_revenue'] / unit)
+        LOUM_fraction_of_winners.append(block['winners']/block['bids_length']*100)
+        original_fraction_of_winners.append(block['block_size']/block['bids_length']*100)
+        """To be Continued"""
+        # original_avg_payments.append()
+        """--------------"""
+
+    if not stats:
+        print("No blocks to analyze")
+        return
+    print(f"Blocks analyzed: {len(stats)}")
+    print(f"avg bids length: {sum(bids_length)/len(bids_length)}")
+    print(f"Avg block size: {sum(avg_block_size)/len(avg_block_size)}")
+    print(f"Avg revenue: {sum(original_revenues) / len(original_revenues)}")
+    # plots.plot_lists(LOUM_avg_payments, original_avg_payments, "LOUM average payment",
+    #            "EIP average payment", "Avg. payment Comparison (removed outliers)")
+    # plots.plot_lists_with_ma(LOUM_avg_payments, original_avg_payments, "LOUM average payment",
+    #            "EIP average payment", "Avg. payment Comparison (removed outliers)-MA")
+    #
+    # plots.plot_lists(LOUM_sum_utilities, original_sum_utilities, "LOUM Utility", "EIP Utility", "Utilities Comparison")
+    # plots.plot_lists_with_ma(LOUM_sum_utilities, original_sum_utilities, "LOUM Utility", "EIP Utility", "Utilities Comparison-MA")
+
+    plots.plot_lists_with_ma(revenues, original_revenues, "LOUM Revenues", "EIP Revenues",
+                           "Revenue comparaion with demand")
+    plots.plot_lists(revenues, original_revenues, "LOUM Revenues", "EIP Revenues", "Revenue comparaion")
+    plots.plot_lists_with_ma(revenues, original_revenues, "LOUM Revenues", "EIP Revenues", "Revenue comparaion-MA")
+
+    # plots.plot_lists(LOUM_fraction_of_winners, original_fraction_of_winners, "LOUM winners fraction",
+    #            "EIP winners fraction", "Winners Fraction Comparison")
+    # plots.plot_lists_with_ma(LOUM_fraction_of_winners, original_fraction_of_winners, "LOUM winners fraction",
+    #            "EIP winners fraction", "Winners Fraction Comparison-MA")
+
+
+    correlations = calculate_correlation(LOUM_sum_utilities, original_sum_utilities)
+    print("Correlation Results:")
+    for metric, value in correlations.items():
+        print(f"{metric}: {value:.4f}")
+
+    results = calculate_correlation_time_cross(LOUM_sum_utilities, original_sum_utilities)
+    print(f"Maximum cross-correlation: {results['Cross_Correlation']['max_correlation']}")
+    print(f"At lag: {results['Cross_Correlation']['lag']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from web3 import Web3
+from web3.exceptions import TooManyRequests
+from .collector import OUTPUT_FILE, PROVIDERS, update_output_file
+
+MAX_IN_FLIGHT_PER_PROVIDER = 4  # Concurrent requests allowed on each provider
+FLUSH_EVERY = 20  # Blocks between checkpoint writes
+MAX_ATTEMPTS = 6  # Rounds over all providers before a call gives up
+RETRY_DELAY = 0.5  # First backoff in seconds, doubled every round
+MAX_RETRY_DELAY = 16
+TRANSIENT_HTTP_STATUS = {429, 500, 502, 503, 504}
+TRANSIENT_RPC_CODES = {429, -32005}  # -32005 is the "limit exceeded" error of Infura and others
+
+
+def format_ether(value_wei):
+    # Same string format the live collector writes
+    return f"{Web3.from_wei(value_wei, 'ether'):.18f}".rstrip('0').rstrip('.')
+
+
+def tx_hash_hex(tx_hash):
+    # HexBytes.hex() may or may not carry the 0x prefix depending on the version
+    tx_hash = tx_hash.hex() if hasattr(tx_hash, 'hex') else str(tx_hash)
+    return tx_hash[2:] if tx_hash.startswith('0x') else tx_hash
+
+
+def is_transient(error):
+    # Rate limits, timeouts and server hiccups are worth waiting out, other errors aren't
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, TimeoutError, TooManyRequests)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in TRANSIENT_HTTP_STATUS
+    rpc_error = (getattr(error, 'rpc_response', None) or {}).get('error') or {}
+    return rpc_error.get('code') in TRANSIENT_RPC_CODES
+
+
+def retry_after(error):
+    # Seconds asked for by a 429's Retry-After header, if any
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers['Retry-After'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return 0
+
+
+def is_method_not_found(error):
+    # The node doesn't implement the method at all, asking it again won't help
+    rpc_error = (getattr(error, 'rpc_response', None) or {}).get('error') or {}
+    return rpc_error.get('code') == -32601
+
+
+class UnsupportedMethod(Exception):
+    pass
+
+
+class ProviderPool:
+    """Round-robins calls over the providers, each with its own in-flight limit.
+
+    A call fails over to the other providers right away; if they all failed with
+    a transient error (rate limit, timeout, 5xx) it backs off and goes round again,
+    up to max_attempts rounds. Calls made with ``method`` skip the providers that
+    answered method-not-found for it before, and raise UnsupportedMethod once none
+    are left.
+    """
+
+    def __init__(self, urls, max_in_flight=MAX_IN_FLIGHT_PER_PROVIDER, retry_delay=RETRY_DELAY,
+                 max_attempts=MAX_ATTEMPTS):
+        # Retries are handled here, across providers, instead of inside web3
+        self.w3_list = [Web3(Web3.HTTPProvider(url, exception_retry_configuration=None)) for url in urls]
+        self.semaphores = [asyncio.Semaphore(max_in_flight) for _ in urls]
+        # web3 is synchronous, so every in-flight request needs its own thread; the
+        # loop's default executor is smaller than that with many providers
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight * len(urls))
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.unsupported = {}
+        self.next_index = 0
+
+    async def call(self, fn, method=None):
+        # Start on the next provider in turn and fail over to the others
+        start = self.next_index
+        self.next_index = (self.next_index + 1) % len(self.w3_list)
+        loop = asyncio.get_running_loop()
+        unsupported = self.unsupported.setdefault(method, set())
+        for attempt in range(self.max_attempts):
+            errors = []
+            for offset in range(len(self.w3_list)):
+                index = (start + offset) % len(self.w3_list)
+                if index in unsupported:
+                    continue
+                try:
+                    async with self.semaphores[index]:
+                        return await loop.run_in_executor(self.executor, fn, self.w3_list[index])
+                except Exception as e:
+                    if method is not None and is_method_not_found(e):
+                        unsupported.add(index)
+                    else:
+                        errors.append(e)
+            if len(unsupported) == len(self.w3_list):
+                raise UnsupportedMethod(method)
+            if attempt + 1 == self.max_attempts or not any(is_transient(e) for e in errors):
+                raise errors[-1]
+            delay = min(self.retry_delay * 2 ** attempt, MAX_RETRY_DELAY)
+            await asyncio.sleep(max([delay] + [retry_after(e) for e in errors]))
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+async def fetch_receipts(pool, block):
+    # One eth_getBlockReceipts call where the node has it, else one call per tx. Only
+    # method-not-found falls back: a rate-limited node shouldn't get more requests
+    try:
+        receipts = await pool.call(lambda w3: w3.eth.get_block_receipts(block['number']),
+                                   method='eth_getBlockReceipts')
+    except UnsupportedMethod:
+        receipts = await asyncio.gather(*[
+            pool.call(lambda w3, h=tx['hash']: w3.eth.get_transaction_receipt(h))
+            for tx in block['transactions']
+        ])
+    return {tx_hash_hex(r['transactionHash']): r for r in receipts}
+
+
+async def fetch_block(pool, block_number):
+    block = await pool.call(lambda w3: w3.eth.get_block(block_number, full_transactions=True))
+    receipts = await fetch_receipts(pool, block)
+
+    fees = {}
+    total_fees = 0
+    total_gas_used = 0
+    for tx in block['transactions']:
+        tx_hash = tx_hash_hex(tx['hash'])
+        gas_used = receipts[tx_hash]['gasUsed']
+        fees[f"0x{tx_hash}"] = {
+            "fee": format_ether(tx['gasPrice'] * tx['gas']),
+            "payment": format_ether(tx['gasPrice'] * gas_used)
+        }
+        total_fees += tx['gasPrice'] * gas_used
+        total_gas_used += gas_used
+
+    # Mempool losers (payment -1) can't be recovered after the fact, only included txs,
+    # so the block is marked for the analysis to tell apart from live ones
+    return {
+        'transactions': fees,
+        'total_priority_fee': format_ether(total_fees - block['baseFeePerGas'] * total_gas_used),
+        'backfilled': True
+    }
+
+
+def load_output(output_file):
+    if os.path.exists(output_file):
+        try:
+            with open(output_file, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            print("Warning: JSON file corrupted, creating new file")
+    return {}
+
+
+def save_output(blocks, output_file):
+    # Merge into what is on disk now, the live collector may have added blocks since
+    def merge(data):
+        for key, block_data in blocks.items():
+            # A live block has the mempool data, so it wins over a backfilled one
+            data.setdefault(key, block_data)
+        # get_transaction_list indexes blocks by position, so keep them in block order
+        return {key: data[key] for key in sorted(data, key=int)}
+
+    update_output_file(merge, output_file)
+
+
+async def backfill(start_block, end_block, providers=PROVIDERS, output_file=OUTPUT_FILE,
+                   max_in_flight=MAX_IN_FLIGHT_PER_PROVIDER, flush_every=FLUSH_EVERY):
+    # The output file doubles as the checkpoint: blocks already in it are skipped.
+    # Returns the blocks that failed, to be retried by running it again
+    existing = load_output(output_file)
+    missing = [n for n in range(start_block, end_block + 1) if str(n) not in existing]
+    del existing
+    print(f"Blocks to backfill: {len(missing)} of {end_block - start_block + 1}")
+    if not missing:
+        return []
+
+    pool = ProviderPool(providers, max_in_flight)
+    # A fixed set of workers pulls block numbers, so only the blocks being
+    # fetched and the ones waiting for the next flush are held in memory
+    block_numbers = iter(missing)
+    unsaved = {}
+    failed = []
+
+    async def worker():
+        for block_number in block_numbers:
+            try:
+                block_data = await fetch_block(pool, block_number)
+            except Exception as e:
+                print(f"Error backfilling block {block_number}: {e}")
+                failed.append(block_number)
+                continue
+            print(f"Backfilled block: {block_number}")
+            unsaved[str(block_number)] = block_data
+            if len(unsaved) >= flush_every:
+                blocks = dict(unsaved)
+                unsaved.clear()
+                await asyncio.to_thread(save_output, blocks, output_file)
+
+    try:
+        await asyncio.gather(*[worker() for _ in range(min(max_in_flight * len(providers), len(missing)))])
+    finally:
+        pool.close()
+        if unsaved:
+            save_output(unsaved, output_file)
+
+    if failed:
+        print(f"Failed blocks (rerun to retry): {sorted(failed)}")
+    return sorted(failed)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='loum backfill', description="Backfill a block range into the collector's output file")
+    parser.add_argument('start_block', type=int)
+    parser.add_argument('end_block', type=int, help="inclusive")
+    parser.add_argument('--provider', action='append', dest='providers',
+                        help="RPC URL, can be repeated (default: PROVIDERS)")
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT_PER_PROVIDER,
+                        help="concurrent requests per provider")
+    parser.add_argument('--flush-every', type=int, default=FLUSH_EVERY)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    asyncio.run(backfill(args.start_block, args.end_block, args.providers or PROVIDERS,
+                         args.output, args.max_in_flight, args.flush_every))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import time
+import numpy as np
+from .core import LOUM
+from .exact import LOUM_exact, WEI_PER_ETHER
+
+SIZES = [10, 100, 300]
+REPEATS = 5
+
+
+def make_bids(n, seed=0):
+    # Fees in the block data are roughly log-normal, a few milli-ether on average
+    rng = np.random.default_rng(seed)
+    return sorted(rng.lognormal(mean=-7, sigma=1.5, size=n).tolist(), reverse=True)
+
+
+def time_loum(n, repeats=REPEATS, seed=0, exact=False):
+    ordered_bids = make_bids(n, seed)
+    loum = LOUM
+    if exact:
+        ordered_bids = np.array([round(bid * WEI_PER_ETHER) for bid in ordered_bids], dtype=np.uint64)
+        loum = LOUM_exact
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loum(ordered_bids)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=SIZES, repeats=REPEATS, exact=False):
+    name = "LOUM_exact" if exact else "LOUM"
+    for n in sizes:
+        seconds = time_loum(n, repeats, exact=exact)
+        print(f"{name} n={n}: {seconds * 1000:.3f} ms (best of {repeats})")
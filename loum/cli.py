@@ -0,0 +1,78 @@
+import argparse
+import sys
+
+# Subcommands import their modules on demand so `loum bench` never loads web3,
+# pandas or matplotlib, and `loum analyze` only loads them when it plots.
+
+
+def analyze(args):
+    from . import analysis
+    analysis.main(args.input or analysis.INPUT_FILE, args.processes, args.exact, args.include_backfilled)
+
+
+def collect(args):
+    import asyncio
+    from . import collector
+    asyncio.run(collector.main())
+
+
+def backfill(args):
+    from . import backfill as backfill_module
+    backfill_module.main(args.args)
+
+
+def bench(args):
+    from . import bench as bench_module
+    bench_module.main(args.sizes or bench_module.SIZES, args.repeats or bench_module.REPEATS, args.exact)
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='loum', description="LOUM auction analysis on Ethereum blocks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('analyze', help="compare LOUM against EIP-1559 on the collected blocks")
+    p.add_argument('--input', help="block data file (default: block_analysis_with_payment.json)")
+    p.add_argument('--processes', type=positive_int, default=1,
+                   help="worker processes reading the blocks from shared memory (default: 1, no pool)")
+    p.add_argument('--exact', action='store_true', help="run LOUM_exact on integer wei")
+    p.add_argument('--include-backfilled', action='store_true',
+                   help="also analyze backfilled blocks, which lack mempool transactions")
+    p.set_defaults(func=analyze)
+
+    p = subparsers.add_parser('collect', help="record new blocks and the mempool live")
+    p.set_defaults(func=collect)
+
+    p = subparsers.add_parser('backfill', add_help=False,
+                              help="fetch a past block range into the output file (see `loum backfill -h`)")
+    p.add_argument('args', nargs=argparse.REMAINDER)
+    p.set_defaults(func=backfill)
+
+    p = subparsers.add_parser('bench', help="time LOUM on random bid lists")
+    p.add_argument('--sizes', type=int, nargs='+', help="number of bids per run")
+    p.add_argument('--repeats', type=int)
+    p.add_argument('--exact', action='store_true', help="time LOUM_exact on integer wei bids")
+    p.set_defaults(func=bench)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    # backfill has its own parser, so pass everything through to it, -h included
+    if args.command == 'backfill':
+        args.args = extra + args.args
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
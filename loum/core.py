@@ -0,0 +1,118 @@
+import json
+import numpy as np
+
+number_of_bids = 10
+J = 100000
+INPUT_FILE = 'block_analysis_with_payment.json'
+
+
+def normalize_to_range(original_list, target_max):
+    # Convert to numpy array if not already
+    arr = np.array(original_list)
+
+    # Get original min and max
+    original_min = np.min(arr)
+    original_max = np.max(arr)
+
+    # Normalize to 0-1 first
+    normalized = (arr - original_min) / (original_max - original_min)
+
+    # Scale to target range (0 to target_max)
+    scaled = normalized * target_max
+
+    return scaled
+
+
+def calculate_correlation_time_cross(list1, list2):
+    # Ensure lists are numpy arrays
+    array1 = np.array(list1)
+    array2 = np.array(list2)
+
+    # Calculate Pearson correlation coefficient
+    correlation = np.corrcoef(array1, array2)[0, 1]
+
+    # Calculate cross-correlation
+    cross_corr = np.correlate(array1 - np.mean(array1),
+                              array2 - np.mean(array2),
+                              mode='full')
+
+    # Normalize cross-correlation
+    cross_corr = cross_corr / (np.std(array1) * np.std(array2) * len(array1))
+
+    # Find max correlation and its lag
+    max_corr = np.max(np.abs(cross_corr))
+    lag = np.argmax(np.abs(cross_corr)) - (len(array1) - 1)
+
+    # Calculate other correlation metrics
+    results = {
+        "Pearson": correlation,
+        "Spearman": np.corrcoef(np.argsort(array1), np.argsort(array2))[0, 1],
+        "Covariance": np.cov(array1, array2)[0, 1],
+        "Cross_Correlation": {
+            "max_correlation": max_corr,
+            "lag": lag,
+            "full_correlation": cross_corr.tolist()
+        }
+    }
+
+    return results
+
+def calculate_correlation(list1, list2):
+    # Calculate Pearson correlation coefficient
+    correlation = np.corrcoef(list1, list2)[0, 1]
+
+    # Calculate other correlation metrics
+    results = {
+        "Pearson": correlation,
+        "Spearman": np.corrcoef(np.argsort(list1), np.argsort(list2))[0, 1],
+        "Covariance": np.cov(list1, list2)[0, 1]
+    }
+
+    return results
+
+
+def get_transaction_list(i, filename=INPUT_FILE):
+    with open(filename, 'r') as file:
+        data = json.loads(file.read())
+
+    # Convert blocks to list and get the i-th block
+    blocks = list(data.items())
+    if i < 0 or i >= len(blocks):
+        raise ValueError(f"Index {i} is out of range. Available blocks: 0-{len(blocks) - 1}")
+
+    block_number, block_data = blocks[i]
+    transactions = block_data.get("transactions", {})
+
+    # Count transactions starting with "0x"
+    count_winners = sum(1 for tx_hash in transactions.keys() if tx_hash.startswith("0x"))
+
+    # Get transaction values
+    transaction_values = [float(value['fee']) for value in transactions.values()]
+    transaction_payments = [float(value['payment']) for value in transactions.values()]
+
+    priority_fee = float(block_data["total_priority_fee"])
+    return transaction_values,transaction_payments, priority_fee, count_winners
+
+
+def MONOPOLISTIC(ordered_bids):
+    i_star = np.argmax([(i + 1) * ordered_bids[i] for i in range(len(ordered_bids))])
+    b_i_star = ordered_bids[i_star]
+    # revenue = b_i_star * (i_star + 1)
+    return b_i_star, i_star
+
+
+def LOUM(ordered_bids):
+    winners = []
+    payments = []
+    # ordered_bids = sorted(bids, reverse=True)
+    for index, bid in enumerate(ordered_bids):
+        current_bids = [ordered_bids[i] for i in range(len(ordered_bids)) if i != index]  #b_{-i}
+        required_payment, index_of_payment = MONOPOLISTIC(current_bids)
+        if bid >= required_payment:
+            winners.append(index)
+            payments.append(required_payment)
+    # winners_after_budget = [i for i in range(index_of_payment)]
+    winners_after_budget = [i for i in range(len(ordered_bids)) if ordered_bids[i] > payments[0]]
+
+    revenue_after_budget = payments[0]*len(winners_after_budget)
+    return payments[0], winners_after_budget, revenue_after_budget
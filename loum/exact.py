@@ -0,0 +1,101 @@
+import numpy as np
+
+WEI_PER_ETHER = 10 ** 18
+_LOW_32 = np.uint64(0xFFFFFFFF)
+_SHIFT_32 = np.uint64(32)
+
+
+def to_wei(value):
+    # Exact wei from the collector's Ether strings ("0.0017...", or -1 for unpaid)
+    if isinstance(value, int):
+        return value
+    value = str(value)
+    sign = -1 if value.startswith('-') else 1
+    whole, _, frac = value.lstrip('-').partition('.')
+    return sign * (int(whole or 0) * WEI_PER_ETHER + int(frac.ljust(18, '0')[:18] or 0))
+
+
+def _mul_128(bids, multipliers):
+    # Full 128-bit (hi, lo) product of uint64 bids and multipliers below 2**32
+    u = multipliers * (bids >> _SHIFT_32)
+    t = multipliers * (bids & _LOW_32)
+    lo = t + (u << _SHIFT_32)
+    hi = (u >> _SHIFT_32) + (lo < t).astype(np.uint64)
+    return hi, lo
+
+
+def _revenue_keys(bids):
+    # Order-preserving int64 keys for (j+1)*b_j and j*b_j, shared between both lists
+    n = len(bids)
+    if int(bids.max()) * n < 2 ** 63:
+        positions = np.arange(n, dtype=np.int64)
+        signed = bids.astype(np.int64)
+        return (positions + 1) * signed, positions * signed
+
+    # The products may not fit in 64 bits: compare them as 128-bit pairs and
+    # replace each with its rank, which keeps ties and order exact
+    positions = np.arange(n, dtype=np.uint64)
+    hi_a, lo_a = _mul_128(bids, positions + np.uint64(1))
+    hi_b, lo_b = _mul_128(bids, positions)
+    hi, lo = np.concatenate([hi_a, hi_b]), np.concatenate([lo_a, lo_b])
+    order = np.lexsort((lo, hi))
+    new_value = np.ones(2 * n, dtype=bool)
+    new_value[1:] = (hi[order][1:] != hi[order][:-1]) | (lo[order][1:] != lo[order][:-1])
+    ranks = np.empty(2 * n, dtype=np.int64)
+    ranks[order] = np.cumsum(new_value)
+    return ranks[:n], ranks[n:]
+
+
+def leave_one_out_payments(bids):
+    """MONOPOLISTIC(b_{-i})[0] for every i at once, with np.argmax's first-index tie-breaking.
+
+    With bid i removed, positions j < i still earn (j+1)*b_j and later bids shift up one,
+    earning j*b_j, so each answer is a prefix max of the first list against a suffix max
+    of the second.
+    """
+    n = len(bids)
+    if n < 2:
+        raise ValueError("LOUM needs at least two bids")
+    index = np.arange(n)
+    keys_a, keys_b = _revenue_keys(bids)
+
+    # Best (j+1)*b_j over j <= k, first index on ties
+    prefix_max = np.maximum.accumulate(keys_a)
+    rises = np.ones(n, dtype=bool)
+    rises[1:] = prefix_max[1:] > prefix_max[:-1]
+    prefix_arg = np.maximum.accumulate(np.where(rises, index, 0))
+
+    # Best j*b_j over j >= k, first index on ties
+    suffix_max = np.maximum.accumulate(keys_b[::-1])[::-1]
+    suffix_arg = np.minimum.accumulate(np.where(keys_b == suffix_max, index, n)[::-1])[::-1]
+
+    # Removing k leaves the prefix up to k-1 and the suffix from k+1; -1 marks an empty side
+    left_max = np.full(n, -1, dtype=np.int64)
+    left_max[1:] = prefix_max[:-1]
+    left_arg = np.zeros(n, dtype=np.int64)
+    left_arg[1:] = prefix_arg[:-1]
+    right_max = np.full(n, -1, dtype=np.int64)
+    right_max[:-1] = suffix_max[1:]
+    right_arg = np.zeros(n, dtype=np.int64)
+    right_arg[:-1] = suffix_arg[1:]
+
+    return bids[np.where(left_max >= right_max, left_arg, right_arg)]
+
+
+def LOUM_exact(ordered_bids):
+    """LOUM on integer bids (wei), exact and vectorized.
+
+    Same results as LOUM, with the payment as an int and the revenue as a Python int
+    so it can't overflow.
+    """
+    try:
+        bids = np.asarray(ordered_bids, dtype=np.uint64)
+    except OverflowError:
+        raise ValueError("LOUM_exact needs bids between 0 and 2**64 - 1 wei (about 18.4 ETH)") from None
+    required_payments = leave_one_out_payments(bids)
+    # First bidder who can afford their leave-one-out price sets the payment
+    payment = required_payments[np.flatnonzero(bids >= required_payments)[0]]
+    winners_after_budget = np.flatnonzero(bids > payment).tolist()
+
+    revenue_after_budget = int(payment) * len(winners_after_budget)
+    return int(payment), winners_after_budget, revenue_after_budget
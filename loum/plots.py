@@ -0,0 +1,145 @@
+import numpy as np
+
+# matplotlib and pandas are only imported the first time a plot is drawn
+_plt = None
+_pd = None
+
+
+def _pyplot():
+    global _plt
+    if _plt is None:
+        # Plots are only saved to files, so the non-GUI backend is enough
+        # (MPLBACKEND still wins if set)
+        import os
+        import matplotlib
+        if 'MPLBACKEND' not in os.environ:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+
+def _pandas():
+    global _pd
+    if _pd is None:
+        import pandas as pd
+        _pd = pd
+    return _pd
+
+
+def plot_lists_with_demand(list1, list2, list3, title1, title2, title3, figure_title):
+    plt = _pyplot()
+    plt.figure(figsize=(12, 6))
+
+    # Plot list3 in background first
+    x3 = np.arange(len(list3))
+    plt.plot(x3, list3, 'g-', linewidth=1, alpha=0.2, label=title3)
+    plt.scatter(x3, list3, color='green', alpha=0.2, s=30)
+
+    x1 = np.arange(len(list1))
+    plt.plot(x1, list1, 'b-', linewidth=1, alpha=0.7, label=title1)
+    plt.scatter(x1, list1, color='blue', alpha=0.5, s=30)
+
+    x2 = np.arange(len(list2))
+    plt.plot(x2, list2, 'r-', linewidth=1, alpha=0.7, label=title2)
+    plt.scatter(x2, list2, color='red', alpha=0.5, s=30)
+
+    plt.title(figure_title, fontsize=16)
+    plt.xlabel('Index')
+    plt.ylabel('Value')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend()
+
+    # Save the plot
+    filename = f"{figure_title.replace(' ', '_')}.png"  # Replace spaces with underscores
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close()  # Close the figure to free memory
+
+
+def plot_lists_with_ma_and_demand(list1, list2, list3, title1, title2, title3, figure_title, window=10):
+    plt = _pyplot()
+    pd = _pandas()
+    plt.figure(figsize=(12, 6))
+
+    # Plot list3 in background first
+    x3 = np.arange(len(list3))
+    plt.plot(x3, list3, 'g-', linewidth=1, alpha=0.2, label=title3)
+    plt.scatter(x3, list3, color='green', alpha=0.2, s=30)
+
+    # Plot list1 and its moving average
+    x1 = np.arange(len(list1))
+    ma1 = pd.Series(list1).rolling(window=window).mean()
+    plt.plot(x1, ma1, 'b-', linewidth=2, label=f'{title1} MA({window})')
+
+    # Plot list2 and its moving average
+    x2 = np.arange(len(list2))
+    ma2 = pd.Series(list2).rolling(window=window).mean()
+    plt.plot(x2, ma2, 'r-', linewidth=2, label=f'{title2} MA({window})')
+
+    plt.title(figure_title, fontsize=16)
+    plt.xlabel('Index')
+    plt.ylabel('Value')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend()
+
+    # Save the plot
+    filename = f"{figure_title.replace(' ', '_')}.png"
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def plot_lists_with_ma(list1, list2, title1, title2, figure_title, window=10):
+    plt = _pyplot()
+    pd = _pandas()
+    plt.figure(figsize=(12, 6))
+
+    x1 = np.arange(len(list1))
+    plt.plot(x1, list1, 'b-', linewidth=1, alpha=0.3, label=f'{title1} raw')
+    plt.scatter(x1, list1, color='blue', alpha=0.3, s=30)
+
+    # Calculate and plot moving average
+    ma1 = pd.Series(list1).rolling(window=window).mean()
+    plt.plot(x1, ma1, 'b-', linewidth=2, label=f'{title1} MA({window})')
+
+    x2 = np.arange(len(list2))
+    plt.plot(x2, list2, 'r-', linewidth=1, alpha=0.3, label=f'{title2} raw')
+    plt.scatter(x2, list2, color='red', alpha=0.3, s=30)
+
+    # Calculate and plot moving average
+    ma2 = pd.Series(list2).rolling(window=window).mean()
+    plt.plot(x2, ma2, 'r-', linewidth=2, label=f'{title2} MA({window})')
+
+    plt.title(figure_title, fontsize=16)
+    plt.xlabel('Index')
+    plt.ylabel('Value')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend()
+
+    # Save the plot
+    filename = f"{figure_title.replace(' ', '_')}.png"
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def plot_lists(list1, list2, title1, title2, figure_title):
+    plt = _pyplot()
+    plt.figure(figsize=(12, 6))
+
+    x1 = np.arange(len(list1))
+    plt.plot(x1, list1, 'b-', linewidth=1, alpha=0.7, label=title1)
+    plt.scatter(x1, list1, color='blue', alpha=0.5, s=30)
+
+    x2 = np.arange(len(list2))
+    plt.plot(x2, list2, 'r-', linewidth=1, alpha=0.7, label=title2)
+    plt.scatter(x2, list2, color='red', alpha=0.5, s=30)
+
+    plt.title(figure_title, fontsize=16)
+    plt.xlabel('Index')
+    plt.ylabel('Value')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend()
+
+    # Save the plot
+    filename = f"{figure_title.replace(' ', '_')}.png"  # Replace spaces with underscores
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close()  # Close the figure to free memory
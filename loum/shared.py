@@ -0,0 +1,170 @@
+import json
+from multiprocessing import Pool, shared_memory
+import numpy as np
+from .core import INPUT_FILE, LOUM
+from .exact import LOUM_exact, to_wei
+
+COLUMNS = ('fees', 'payments', 'offsets', 'priority_fees', 'count_winners', 'backfilled')
+MAX_UINT64 = 2 ** 64 - 1
+MAX_INT64 = 2 ** 63 - 1
+
+
+def load_block_columns(filename=INPUT_FILE, exact=False):
+    # Flatten every block into one column per field; block i is offsets[i]:offsets[i + 1].
+    # With exact=True fees, payments and priority fees are integer wei (payment -1 stays -1)
+    parse = to_wei if exact else float
+    with open(filename, 'r') as file:
+        data = json.loads(file.read())
+
+    fees, payments, offsets, priority_fees, count_winners, backfilled = [], [], [0], [], [], []
+    for block_number, block_data in data.items():
+        transactions = block_data.get("transactions", {})
+        fees.extend(parse(value['fee']) for value in transactions.values())
+        payments.extend(parse(value['payment']) for value in transactions.values())
+        if exact:
+            _check_wei_range(block_number, fees[offsets[-1]:], payments[offsets[-1]:])
+        offsets.append(len(fees))
+        priority_fees.append(parse(block_data["total_priority_fee"]))
+        count_winners.append(sum(1 for tx_hash in transactions.keys() if tx_hash.startswith("0x")))
+        # Backfilled blocks have no mempool transactions, see backfill.fetch_block
+        backfilled.append(block_data.get("backfilled", False))
+
+    if exact:
+        # A block's priority fee can go well past 2**64 wei on MEV blocks, so it
+        # is kept as two uint64 halves and put back together in block()
+        priority_fees = [(fee >> 64, fee & MAX_UINT64) for fee in priority_fees]
+    return {
+        'fees': np.array(fees, dtype=np.uint64 if exact else np.float64),
+        'payments': np.array(payments, dtype=np.int64 if exact else np.float64),
+        'offsets': np.array(offsets, dtype=np.int64),
+        'priority_fees': np.array(priority_fees, dtype=np.uint64 if exact else np.float64).reshape(len(offsets) - 1, 2 if exact else 1),
+        'count_winners': np.array(count_winners, dtype=np.int64),
+        'backfilled': np.array(backfilled, dtype=bool),
+    }
+
+
+def _check_wei_range(block_number, fees, payments):
+    # Fees are bids for LOUM_exact and must fit uint64, payments keep the -1 marker in int64
+    if fees and max(fees) > MAX_UINT64:
+        raise ValueError(f"Block {block_number}: fee of {max(fees)} wei doesn't fit in uint64 "
+                         f"(exact mode supports fees up to {MAX_UINT64} wei, about 18.4 ETH)")
+    if payments and max(payments) > MAX_INT64:
+        raise ValueError(f"Block {block_number}: payment of {max(payments)} wei doesn't fit in int64 "
+                         f"(exact mode supports payments up to {MAX_INT64} wei, about 9.2 ETH)")
+
+
+class SharedBlockColumns:
+    """Block columns held in shared memory, readable from any process by block index.
+
+    The creating process builds it with ``create``/``from_file`` and passes ``handle``
+    (segment names, shapes and dtypes only) to workers, which ``attach`` to it.
+    """
+
+    def __init__(self, segments, arrays, owner):
+        self.segments = segments
+        self.arrays = arrays
+        self.owner = owner
+
+    @classmethod
+    def create(cls, columns):
+        segments, arrays = {}, {}
+        for key in COLUMNS:
+            source = columns[key]
+            # SharedMemory can't be zero-sized, empty columns still get a byte
+            shm = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+            arrays[key] = np.ndarray(source.shape, dtype=source.dtype, buffer=shm.buf)
+            arrays[key][:] = source
+            segments[key] = shm
+        return cls(segments, arrays, owner=True)
+
+    @classmethod
+    def from_file(cls, filename=INPUT_FILE, exact=False):
+        return cls.create(load_block_columns(filename, exact))
+
+    @property
+    def handle(self):
+        return {key: (self.segments[key].name, self.arrays[key].shape, self.arrays[key].dtype.str)
+                for key in COLUMNS}
+
+    @classmethod
+    def attach(cls, handle):
+        segments, arrays = {}, {}
+        # Pool workers share the creator's resource tracker, so attaching here
+        # doesn't hand the segments to anyone else to unlink
+        for key, (name, shape, dtype) in handle.items():
+            segments[key] = shared_memory.SharedMemory(name=name)
+            arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segments[key].buf)
+        return cls(segments, arrays, owner=False)
+
+    def __len__(self):
+        return len(self.arrays['priority_fees'])
+
+    def block(self, i):
+        # Same values as get_transaction_list(i), but as read-only views into shared memory
+        if i < 0 or i >= len(self):
+            raise ValueError(f"Index {i} is out of range. Available blocks: 0-{len(self) - 1}")
+        start, end = self.arrays['offsets'][i], self.arrays['offsets'][i + 1]
+        fees = self.arrays['fees'][start:end]
+        payments = self.arrays['payments'][start:end]
+        fees.flags.writeable = False
+        payments.flags.writeable = False
+        priority_fee = self.arrays['priority_fees'][i]
+        if priority_fee.dtype.kind == 'u':
+            priority_fee = (int(priority_fee[0]) << 64) | int(priority_fee[1])
+        else:
+            priority_fee = float(priority_fee[0])
+        return fees, payments, priority_fee, int(self.arrays['count_winners'][i])
+
+    def close(self):
+        # The views must go before the buffers they point into can be released
+        self.arrays = {}
+        for shm in self.segments.values():
+            shm.close()
+            if self.owner:
+                shm.unlink()
+        self.segments = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_worker_columns = None
+
+
+def _init_worker(handle):
+    global _worker_columns
+    _worker_columns = SharedBlockColumns.attach(handle)
+
+
+def worker_block(i):
+    return _worker_columns.block(i)
+
+
+def _loum_block(i):
+    bids, _, priority_fee, count_winners = worker_block(i)
+    ordered_bids = np.sort(bids)[::-1]
+    if bids.dtype.kind == 'u':
+        payment, winners_after_budget, revenue_after_budget = LOUM_exact(ordered_bids)
+    else:
+        payment, winners_after_budget, revenue_after_budget = LOUM(ordered_bids.tolist())
+    return payment, len(winners_after_budget), revenue_after_budget, priority_fee, count_winners
+
+
+def map_blocks(fn, columns, processes=None, chunksize=16, indices=None):
+    """Run ``fn(i)`` for every block index (or only ``indices``) in a pool whose workers read ``columns`` from shared memory.
+
+    ``fn`` must be a module-level function; it reads the block through ``worker_block(i)``.
+    Only block indices and ``fn``'s return values cross process boundaries.
+    """
+    with Pool(processes, initializer=_init_worker, initargs=(columns.handle,)) as pool:
+        return pool.map(fn, range(len(columns)) if indices is None else indices, chunksize=chunksize)
+
+
+def parallel_loum(filename=INPUT_FILE, processes=None, exact=False):
+    # (payment, number of winners, LOUM revenue, original revenue, original winners) per block,
+    # in integer wei with exact=True
+    with SharedBlockColumns.from_file(filename, exact) as columns:
+        return map_blocks(_loum_block, columns, processes)
@@ -0,0 +1,254 @@
+import json
+import asyncio
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from loum import backfill
+from loum.analysis import analyze_blocks
+
+GWEI = 10 ** 9
+BASE_FEE = 10 * GWEI
+
+# Block number -> [(gasPrice, gas limit, gasUsed)]
+CHAIN = {
+    100: [(12 * GWEI, 21000, 21000), (15 * GWEI, 100000, 60000)],
+    101: [(11 * GWEI, 50000, 42000), (14 * GWEI, 40000, 40000)],
+    102: [(20 * GWEI, 200000, 150000), (10 * GWEI, 21000, 21000), (13 * GWEI, 30000, 25000)],
+}
+# Any other block number gets these
+FILLER_TXS = [(12 * GWEI, 21000, 21000), (13 * GWEI, 21000, 21000)]
+
+
+def block_txs(number):
+    return CHAIN.get(number, FILLER_TXS)
+
+
+def tx_hash(block_number, index):
+    return f"{block_number:032x}{index:032x}"
+
+
+class FakeNode(ThreadingHTTPServer):
+    """Just enough JSON-RPC for backfill: blocks with full transactions and their receipts."""
+
+    daemon_threads = True
+
+    def __init__(self, block_receipts=True, rate_limited=0, rate_limited_methods=(), delay=0):
+        super().__init__(('127.0.0.1', 0), FakeNodeHandler)
+        self.block_receipts = block_receipts
+        self.rate_limited = rate_limited
+        self.rate_limited_methods = set(rate_limited_methods)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def rpc(self, method, params):
+        if method == 'eth_getBlockByNumber':
+            number = int(params[0], 16)
+            return {
+                'number': hex(number),
+                'hash': '0x' + f"{number:064x}",
+                'parentHash': '0x' + f"{number - 1:064x}",
+                'baseFeePerGas': hex(BASE_FEE),
+                'transactions': [{
+                    'hash': '0x' + tx_hash(number, i),
+                    'blockNumber': hex(number),
+                    'transactionIndex': hex(i),
+                    'gasPrice': hex(gas_price),
+                    'gas': hex(gas),
+                } for i, (gas_price, gas, _) in enumerate(block_txs(number))],
+            }
+        if method == 'eth_getBlockReceipts' and self.block_receipts:
+            number = int(params[0], 16)
+            return [self.receipt(number, i) for i in range(len(block_txs(number)))]
+        if method == 'eth_getTransactionReceipt':
+            hash_hex = params[0][2:] if params[0].startswith('0x') else params[0]
+            return self.receipt(int(hash_hex[:32], 16), int(hash_hex[32:], 16))
+        raise NotImplementedError(method)
+
+    def receipt(self, number, index):
+        return {
+            'transactionHash': '0x' + tx_hash(number, index),
+            'blockNumber': hex(number),
+            'transactionIndex': hex(index),
+            'gasUsed': hex(block_txs(number)[index][2]),
+        }
+
+
+class FakeNodeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        node = self.server
+        with node.lock:
+            node.calls.append((request['method'], request['params']))
+            limited = node.rate_limited > 0 or request['method'] in node.rate_limited_methods
+            node.rate_limited -= node.rate_limited > 0
+            node.in_flight += 1
+            node.peak_in_flight = max(node.peak_in_flight, node.in_flight)
+        try:
+            time.sleep(node.delay)
+            self.respond(request, limited)
+        finally:
+            with node.lock:
+                node.in_flight -= 1
+
+    def respond(self, request, limited):
+        node = self.server
+        if limited:
+            self.send_response(429)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            body = {'jsonrpc': '2.0', 'id': request['id'], 'result': node.rpc(request['method'], request['params'])}
+        except NotImplementedError:
+            body = {'jsonrpc': '2.0', 'id': request['id'],
+                    'error': {'code': -32601, 'message': 'the method does not exist/is not available'}}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def start_node():
+    nodes = []
+
+    def start(**kwargs):
+        node = FakeNode(**kwargs)
+        threading.Thread(target=node.serve_forever, daemon=True).start()
+        nodes.append(node)
+        return node
+
+    yield start
+    for node in nodes:
+        node.shutdown()
+        node.server_close()
+
+
+def run_backfill(node, output, start=100, end=102, *args):
+    backfill.main([str(start), str(end), '--provider', node.url, '--output', str(output), *args])
+    with open(output) as f:
+        return json.load(f)
+
+
+def expected_block(number):
+    # What the collector writes for the included transactions of a block
+    def ether(wei):
+        return f"{Decimal(wei) / 10 ** 18:.18f}".rstrip('0').rstrip('.')
+
+    transactions = {
+        '0x' + tx_hash(number, i): {'fee': ether(gas_price * gas), 'payment': ether(gas_price * gas_used)}
+        for i, (gas_price, gas, gas_used) in enumerate(block_txs(number))
+    }
+    priority_fee = sum((gas_price - BASE_FEE) * gas_used for gas_price, _, gas_used in block_txs(number))
+    return {'transactions': transactions, 'total_priority_fee': ether(priority_fee), 'backfilled': True}
+
+
+def methods(node):
+    return [method for method, _ in node.calls]
+
+
+def test_writes_collector_format(start_node, tmp_path):
+    node = start_node()
+    data = run_backfill(node, tmp_path / 'blocks.json')
+    assert list(data) == ['100', '101', '102']
+    for number in CHAIN:
+        assert data[str(number)] == expected_block(number)
+    assert 'eth_getTransactionReceipt' not in methods(node)
+
+
+def test_resumes_from_checkpoint(start_node, tmp_path):
+    output = tmp_path / 'blocks.json'
+    live_block = {'transactions': {'0xabc': {'fee': '0.1', 'payment': '0.05'}, 'def': {'fee': '0.2', 'payment': -1}},
+                  'total_priority_fee': '0.01'}
+    output.write_text(json.dumps({'101': live_block}))
+    node = start_node()
+
+    data = run_backfill(node, output)
+    assert list(data) == ['100', '101', '102']
+    assert data['101'] == live_block
+    assert hex(101) not in [params[0] for method, params in node.calls if method == 'eth_getBlockByNumber']
+
+    # Nothing left to fetch the second time round
+    node.calls.clear()
+    assert run_backfill(node, output) == data
+    assert node.calls == []
+
+
+def test_falls_back_to_transaction_receipts(start_node, tmp_path):
+    node = start_node(block_receipts=False)
+    # One block at a time, so every block after the first can rely on the -32601
+    data = run_backfill(node, tmp_path / 'blocks.json', 100, 102, '--max-in-flight', '1')
+    for number in CHAIN:
+        assert data[str(number)] == expected_block(number)
+    assert methods(node).count('eth_getTransactionReceipt') == sum(len(txs) for txs in CHAIN.values())
+    # The -32601 answer is remembered for the provider
+    assert methods(node).count('eth_getBlockReceipts') == 1
+
+
+def test_rate_limited_block_receipts_do_not_fall_back(start_node):
+    node = start_node(rate_limited_methods={'eth_getBlockReceipts'})
+    pool = backfill.ProviderPool([node.url], retry_delay=0.01, max_attempts=3)
+
+    async def fetch():
+        try:
+            block = await pool.call(lambda w3: w3.eth.get_block(100, full_transactions=True))
+            return await backfill.fetch_receipts(pool, block)
+        finally:
+            pool.close()
+
+    with pytest.raises(Exception) as error:
+        asyncio.run(fetch())
+    assert backfill.is_transient(error.value)
+    assert methods(node).count('eth_getBlockReceipts') == 3
+    assert 'eth_getTransactionReceipt' not in methods(node)
+
+
+def test_keeps_max_in_flight_requests_busy(start_node, tmp_path):
+    # More than the default executor's threads, and well over one request per block
+    node = start_node(delay=0.2)
+    output = tmp_path / 'blocks.json'
+    assert asyncio.run(backfill.backfill(1000, 1099, [node.url], str(output), max_in_flight=20)) == []
+    with open(output) as f:
+        assert len(json.load(f)) == 100
+    assert 15 <= node.peak_in_flight <= 20
+
+
+def test_retries_rate_limited_calls(start_node, tmp_path):
+    node = start_node(rate_limited=2)
+    data = run_backfill(node, tmp_path / 'blocks.json', 100, 100)
+    assert data['100'] == expected_block(100)
+    assert node.rate_limited == 0
+
+
+def test_save_keeps_blocks_written_meanwhile(tmp_path):
+    # The live collector adds blocks to the same file while backfill is running
+    output = tmp_path / 'blocks.json'
+    live_block = {'transactions': {}, 'total_priority_fee': '0.5'}
+    output.write_text(json.dumps({'105': live_block, '101': live_block}))
+    backfill.save_output({'100': expected_block(100), '101': expected_block(101)}, output)
+    with open(output) as f:
+        data = json.load(f)
+    assert list(data) == ['100', '101', '105']
+    assert data['100'] == expected_block(100)
+    assert data['101'] == live_block
+
+
+def test_analysis_skips_backfilled_blocks(start_node, tmp_path):
+    output = tmp_path / 'blocks.json'
+    run_backfill(start_node(), output)
+    assert analyze_blocks(output) == []
+    assert len(analyze_blocks(output, include_backfilled=True)) == len(CHAIN)
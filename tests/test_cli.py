@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_imports_leave_heavy_modules_unloaded():
+    result = run_python('-c', (
+        "import sys, loum, loum.analysis\n"
+        "print(sorted(m for m in ('pandas', 'matplotlib', 'web3') if m in sys.modules))"
+    ))
+    assert result.stdout.strip() == '[]'
+
+
+def test_bench_runs():
+    result = run_python('-m', 'loum', 'bench', '--sizes', '10', '--repeats', '1')
+    assert result.stdout.startswith('LOUM n=10:')
+
+
+def test_backfill_help_names_the_subcommand():
+    result = run_python('-m', 'loum', 'backfill', '-h')
+    assert result.stdout.startswith('usage: loum backfill')
@@ -0,0 +1,142 @@
+import json
+import random
+import numpy as np
+import pytest
+from loum.core import LOUM, MONOPOLISTIC
+from loum.exact import LOUM_exact, leave_one_out_payments, to_wei
+from loum.shared import load_block_columns
+
+
+def reference_payments(bids):
+    # MONOPOLISTIC(b_{-i}) on Python ints, the way LOUM computes it
+    payments = []
+    for index in range(len(bids)):
+        current_bids = [bids[i] for i in range(len(bids)) if i != index]
+        revenues = [(i + 1) * current_bids[i] for i in range(len(current_bids))]
+        payments.append(current_bids[revenues.index(max(revenues))])
+    return payments
+
+
+def float_loum(bids):
+    payment, winners, revenue = LOUM([float(bid) for bid in bids])
+    return int(payment), winners, int(revenue)
+
+
+def random_bids(rng, n, high):
+    # Few distinct values so ties in (i+1)*b_i and between bids are common
+    values = [rng.randint(0, high) for _ in range(rng.randint(1, 6))]
+    return [rng.choice(values) for _ in range(n)]
+
+
+@pytest.mark.parametrize("bids", [
+    [5, 3],
+    [3, 5],
+    [4, 4],
+    [0, 0],
+    [2, 1],
+    [6, 3, 2],
+    [4, 2, 0, 0],
+    [3, 3, 3, 3],
+    [4, 9, 2],
+])
+def test_small_cases_match_loum(bids):
+    assert LOUM_exact(bids) == float_loum(bids)
+    assert [int(p) for p in leave_one_out_payments(np.array(bids, dtype=np.uint64))] == reference_payments(bids)
+
+
+def test_matches_loum_with_ties_and_zeros():
+    # Small ints are exact as floats, so the float LOUM is the reference here
+    rng = random.Random(0)
+    for _ in range(3000):
+        bids = random_bids(rng, rng.randint(2, 40), 30)
+        if rng.random() < 0.7:
+            bids.sort(reverse=True)
+        got = [int(p) for p in leave_one_out_payments(np.array(bids, dtype=np.uint64))]
+        assert got == reference_payments(bids), bids
+        try:
+            expected = float_loum(bids)
+        except IndexError:
+            # No bidder can afford its price, LOUM fails the same way
+            with pytest.raises(IndexError):
+                LOUM_exact(bids)
+            continue
+        assert LOUM_exact(bids) == expected, bids
+
+
+def test_monopolistic_agrees_on_int64_path():
+    rng = random.Random(1)
+    for _ in range(500):
+        n = rng.randint(2, 50)
+        bids = random_bids(rng, n, 2 ** 63 // n // 2)
+        assert max(bids) * n < 2 ** 63
+        got = [int(p) for p in leave_one_out_payments(np.array(bids, dtype=np.uint64))]
+        assert got == reference_payments(bids)
+        assert got[0] == MONOPOLISTIC(bids[1:])[0]
+
+
+def test_rank_path_near_uint64_max():
+    rng = random.Random(2)
+    near_max = [2 ** 64 - 1, 2 ** 64 - 2, 2 ** 63, 2 ** 63 + 1, 2 ** 32, 0, 1]
+    for _ in range(500):
+        n = rng.randint(2, 60)
+        bids = [rng.choice(near_max) if rng.random() < 0.5 else rng.randint(0, 2 ** 64 - 1) for _ in range(n)]
+        if max(bids) * n < 2 ** 63:
+            bids[0] = 2 ** 64 - 1
+        got = [int(p) for p in leave_one_out_payments(np.array(bids, dtype=np.uint64))]
+        assert got == reference_payments(bids), bids
+
+
+def test_revenue_is_a_python_int():
+    bids = [2 ** 64 - 1] * 5 + [1]
+    payment, winners, revenue = LOUM_exact(bids)
+    assert payment == 2 ** 64 - 1
+    assert revenue == payment * len(winners)
+
+
+def test_rejects_bids_that_do_not_fit():
+    with pytest.raises(ValueError):
+        LOUM_exact([2 ** 64, 1])
+    with pytest.raises(ValueError):
+        LOUM_exact([5])
+
+
+def test_to_wei():
+    assert to_wei("0.00175799909434816") == 1757999094348160
+    assert to_wei("1") == 10 ** 18
+    assert to_wei("0.000000000000000001") == 1
+    assert to_wei(-1) == -1
+
+
+def write_block_file(tmp_path, fee, priority_fee):
+    path = tmp_path / "blocks.json"
+    path.write_text(json.dumps({"1": {
+        "transactions": {
+            "0xa": {"fee": fee, "payment": "0.5"},
+            "0xb": {"fee": "0.25", "payment": "0.2"},
+            "c": {"fee": "0.3", "payment": -1},
+        },
+        "total_priority_fee": priority_fee,
+    }}))
+    return path
+
+
+def test_exact_columns_keep_large_priority_fees(tmp_path):
+    path = write_block_file(tmp_path, "1", "100.000000000000000001")
+    columns = load_block_columns(path, exact=True)
+    hi, lo = (int(x) for x in columns['priority_fees'][0])
+    assert (hi << 64) | lo == 100 * 10 ** 18 + 1
+    assert columns['payments'].tolist() == [5 * 10 ** 17, 2 * 10 ** 17, -1]
+
+
+def test_exact_columns_reject_fees_past_uint64(tmp_path):
+    path = write_block_file(tmp_path, "20", "10")
+    with pytest.raises(ValueError, match="Block 1"):
+        load_block_columns(path, exact=True)
+
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_empty_block_file(tmp_path, exact):
+    path = tmp_path / "blocks.json"
+    path.write_text("{}")
+    columns = load_block_columns(path, exact=exact)
+    assert columns['priority_fees'].shape == (0, 2 if exact else 1)
@@ -0,0 +1,65 @@
+import json
+import os
+import pytest
+from loum import analysis, cli
+from loum.analysis import analyze_blocks
+from loum.core import LOUM, get_transaction_list
+from loum.shared import SharedBlockColumns, parallel_loum
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), os.pardir, 'block_analysis_with_payment_thresh20.json')
+
+
+def sequential_loum(filename):
+    with open(filename) as f:
+        n_blocks = len(json.load(f))
+    results = []
+    for i in range(n_blocks):
+        bids, _, priority_fee, count_winners = get_transaction_list(i, filename)
+        payment, winners_after_budget, revenue_after_budget = LOUM(sorted(bids, reverse=True))
+        results.append((payment, len(winners_after_budget), revenue_after_budget, priority_fee, count_winners))
+    return results
+
+
+def test_parallel_loum_matches_sequential():
+    expected = sequential_loum(DATA_FILE)
+    assert parallel_loum(DATA_FILE, processes=2) == expected
+
+
+def test_parallel_loum_exact_agrees():
+    expected = sequential_loum(DATA_FILE)
+    exact = parallel_loum(DATA_FILE, processes=2, exact=True)
+    assert len(exact) == len(expected)
+    for (payment, winners, revenue, priority_fee, count), floats in zip(exact, expected):
+        assert (winners, count) == (floats[1], floats[4])
+        assert payment / 10 ** 18 == pytest.approx(floats[0], rel=1e-12)
+        assert revenue / 10 ** 18 == pytest.approx(floats[2], rel=1e-12)
+        assert priority_fee / 10 ** 18 == pytest.approx(floats[3], rel=1e-12)
+
+
+def test_block_views_match_get_transaction_list():
+    with SharedBlockColumns.from_file(DATA_FILE) as columns:
+        for i in range(len(columns)):
+            fees, payments, priority_fee, count_winners = columns.block(i)
+            assert (fees.tolist(), payments.tolist(), priority_fee, count_winners) == get_transaction_list(i, DATA_FILE)
+            assert not fees.flags.writeable
+            del fees, payments
+        with pytest.raises(ValueError):
+            columns.block(len(columns))
+
+
+def test_analyze_blocks_same_with_a_pool():
+    assert analyze_blocks(DATA_FILE, processes=2) == analyze_blocks(DATA_FILE, processes=1)
+
+
+def test_exact_analysis_fails_on_values_out_of_range(tmp_path):
+    path = tmp_path / 'blocks.json'
+    path.write_text(json.dumps({"1": {"transactions": {"0xa": {"fee": "20", "payment": "1"},
+                                                       "0xb": {"fee": "1", "payment": "1"}},
+                                      "total_priority_fee": "1"}}))
+    with pytest.raises(ValueError, match="doesn't fit in uint64"):
+        analysis.main(str(path), exact=True)
+
+
+def test_analyze_rejects_zero_processes():
+    with pytest.raises(SystemExit):
+        cli.main(['analyze', '--processes', '0'])